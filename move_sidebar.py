@@ -2,8 +2,8 @@
 # /// script
 # requires-python = ">=3.8"
 # dependencies = [
-#     "beautifulsoup4>=4.12.0",
 #     "lxml>=4.9.0",
+#     "selectolax>=0.3.21",
 #     "click>=8.0.0",
 #     "rich>=13.0.0",
 # ]
@@ -21,186 +21,481 @@ Usage:
     python move_sidebar.py input.html --execute    # Actually modify the file
 """
 
+import hashlib
+import json
+import os
 import sys
+from collections import deque
+from contextlib import ExitStack
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain, islice, repeat
 from pathlib import Path
-from typing import List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import click
-from bs4 import BeautifulSoup
+from lxml import etree, html
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.prompt import Confirm
 
+try:
+    import selectolax
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    # Fall back to the lxml implementation when selectolax is not installed
+    LexborHTMLParser = None
+
 console = Console()
 
+# A page without this byte string cannot have an element with id "sidebar", however the attribute is
+# written (ID="sidebar", id = 'sidebar', ...), so it is safe to skip without parsing
+_SIDEBAR_MARKER = b'sidebar'
 
-def move_sidebar_after_content(html_content: str) -> str:
-    """
-    Parse HTML and move sidebar section to immediately follow content section.
-    Also removes aside tags with duplicate IDs and specific unwanted asides within the sidebar section,
-    removes script elements with jetpack-*, sharing-js*, comment-reply* IDs and speculationrules type,
-    removes iframe with likes-master ID, and removes divs with sharedaddy* classes.
+# Files are read as bytes and handed straight to lxml; decode them as UTF-8 like the site was saved.
+# default_doctype=False stops libxml2 inventing an HTML 4.0 doctype for pages that have none.
+_HTML_PARSER = html.HTMLParser(encoding='utf-8', default_doctype=False)
 
-    Args:
-        html_content: Raw HTML content as string
+# Dry-runs only need counts, so they parse into a smaller tree without comments or blank text
+_COUNTING_PARSER = html.HTMLParser(
+    encoding='utf-8', default_doctype=False, remove_comments=True, remove_blank_text=True
+)
 
-    Returns:
-        Modified HTML content with sidebar moved after content, duplicate ID asides removed, specific asides removed, unwanted scripts/iframes/divs removed
+# Number of files each worker reads ahead on a background thread while it parses
+_PREFETCH_DEPTH = 4
 
-    Raises:
-        ValueError: If required sections are not found
-    """
-    soup = BeautifulSoup(html_content, 'lxml')
+# Documents larger than this are stream-parsed so unwanted elements are dropped while parsing
+_STREAMING_THRESHOLD = 256 * 1024
+_STREAMING_CHUNK_SIZE = 64 * 1024
 
-    # Find the content and sidebar sections
-    content_section = soup.find(id='content')
-    sidebar_section = soup.find(id='sidebar')
+# Results are cached by content hash; bump CACHE_VERSION whenever the transform changes
+CACHE_VERSION = 2
 
-    if not content_section:
-        raise ValueError("Section with id 'content' not found in HTML")
+# Lexbor and lxml serialize the same page differently, so cached output is only reused by the same parser build
+_CACHE_BACKEND = (
+    f'lexbor-{selectolax.__version__}' if LexborHTMLParser is not None
+    else f'lxml-{etree.__version__}-libxml2-{".".join(map(str, etree.LIBXML_VERSION))}'
+)
 
-    if not sidebar_section:
-        raise ValueError("Section with id 'sidebar' not found in HTML")
+# Sidebar asides that are always removed
+_UNWANTED_ASIDE_IDS = frozenset({'search-2', 'meta-2'})
 
-    # Remove unwanted script elements from entire document
-    unwanted_scripts = []
+# XPath queries are compiled once at import and reused for every file
+_UNWANTED_SCRIPTS_XPATH = etree.XPath(
+    "//script[starts-with(@id, 'sharing-js') or starts-with(@id, 'comment-reply') or @type='speculationrules']"
+)
+_JETPACK_TAGS_XPATH = etree.XPath("//*[starts-with(@id, 'jetpack-')]")
+_LIKES_IFRAME_XPATH = etree.XPath("//iframe[@id='likes-master']")
+_SHAREDADDY_DIVS_XPATH = etree.XPath("//div[contains(concat(' ', normalize-space(@class)), ' sharedaddy')]")
+_SIDEBAR_ASIDES_XPATH = etree.XPath(".//aside[@id]")
+_ELEMENT_BY_ID_XPATH = etree.XPath("//*[@id=$id]")
+
+# Placeholder tag given to unwanted elements so they can all be stripped in one pass
+_REMOVED_TAG = 'move-sidebar-removed'
+
+# CSS equivalents of the XPath queries for the selectolax (Lexbor) parser
+_UNWANTED_SCRIPTS_CSS = 'script[id^="sharing-js"], script[id^="comment-reply"], script[type="speculationrules"]'
+_JETPACK_TAGS_CSS = '[id^="jetpack-"]'
+_LIKES_IFRAME_CSS = 'iframe#likes-master'
+# Candidates only: class tokens may be split by any whitespace, so matches are confirmed in Python
+_SHAREDADDY_DIVS_CSS = 'div[class*="sharedaddy"]'
+
+
+def _remove_element(element: etree._Element) -> None:
+    """Detach an element from the tree, leaving its tail text in place."""
+    parent = element.getparent()
+    if parent is None:
+        return
+    if element.tail:
+        previous = element.getprevious()
+        if previous is None:
+            parent.text = (parent.text or '') + element.tail
+        else:
+            previous.tail = (previous.tail or '') + element.tail
+    parent.remove(element)
 
-    # Find sharing-js* scripts
 
-    sharing_scripts = soup.find_all('script', id=lambda x: x and x.startswith('sharing-js'))
-    unwanted_scripts.extend(sharing_scripts)
+def _mark_for_removal(elements: List[etree._Element], limit: Optional[int] = None) -> int:
+    """
+    Retag elements with _REMOVED_TAG and return how many were marked.
 
-    # Find comment-reply* scripts
-    comment_scripts = soup.find_all('script', id=lambda x: x and x.startswith('comment-reply'))
-    unwanted_scripts.extend(comment_scripts)
+    Elements that are already marked, or sit inside a marked subtree, are skipped so the counts match
+    what the query would have found had earlier removals happened straight away.
+    """
+    survivors = [
+        element for element in elements
+        if element.tag != _REMOVED_TAG and next(element.iterancestors(_REMOVED_TAG), None) is None
+    ][:limit]
+    for element in survivors:
+        element.tag = _REMOVED_TAG
+    return len(survivors)
 
-    # Find speculationrules scripts
-    speculation_scripts = soup.find_all('script', type='speculationrules')
-    unwanted_scripts.extend(speculation_scripts)
 
-    scripts_removed = len(unwanted_scripts)
-    for script in unwanted_scripts:
-        script.decompose()
+def _remove_unwanted_elements(doc: etree._Element) -> Dict[str, int]:
+    """Remove unwanted scripts, jetpack tags, the likes iframe and sharedaddy divs from a parsed document."""
+    # Remove sharing-js*, comment-reply* and speculationrules scripts in a single document walk
+    scripts_removed = _mark_for_removal(_UNWANTED_SCRIPTS_XPATH(doc))
 
     # Remove any tag with jetpack-* ID
-    jetpack_tags = soup.find_all(id=lambda x: x and x.startswith('jetpack-'))
-    jetpack_tags_removed = len(jetpack_tags)
-    for tag in jetpack_tags:
-        tag.decompose()
+    jetpack_tags_removed = _mark_for_removal(_JETPACK_TAGS_XPATH(doc))
 
     # Remove iframe with likes-master ID
-    likes_iframe = soup.find('iframe', id='likes-master')
+    iframe_removed = _mark_for_removal(_LIKES_IFRAME_XPATH(doc), limit=1)
+
+    # Remove divs with any class starting with sharedaddy
+    divs_removed = _mark_for_removal(_SHAREDADDY_DIVS_XPATH(doc))
+
+    # Drop everything marked above in one C-level walk, keeping each element's tail text in place
+    etree.strip_elements(doc, _REMOVED_TAG, with_tail=False)
+
+    return {
+        'scripts': scripts_removed,
+        'jetpack': jetpack_tags_removed,
+        'iframe': iframe_removed,
+        'divs': divs_removed,
+    }
+
+
+def _inside_jetpack_tag(element: etree._Element) -> bool:
+    """Return True if any ancestor of the element has an id starting with jetpack-."""
+    return any((ancestor.get('id') or '').startswith('jetpack-') for ancestor in element.iterancestors())
+
+
+def _drop_streamed_elements(events, removed: Dict[str, int]) -> None:
+    """
+    Remove completed unwanted elements from a batch of pull-parser events, tallying them in removed.
+
+    The checks mirror the XPath queries used by _remove_unwanted_elements. End events arrive
+    children-first, so the likes iframe and sharedaddy divs are not counted when they sit inside a
+    jetpack-* element: the DOM path removes jetpack tags first and never sees them. Scripts and the
+    iframe hold only raw text, so no other ancestor can hide a match.
+    """
+    for _, element in events:
+        tag = element.tag
+        element_id = element.get('id') or ''
+        if tag == 'script' and (element_id.startswith(('sharing-js', 'comment-reply'))
+                                or element.get('type') == 'speculationrules'):
+            removed['scripts'] += 1
+        elif element_id.startswith('jetpack-'):
+            removed['jetpack'] += 1
+        elif tag == 'iframe' and element_id == 'likes-master':
+            # Leave it for the jetpack ancestor to take, so a later likes iframe can still be the one removed
+            if removed['iframe'] or _inside_jetpack_tag(element):
+                continue
+            removed['iframe'] = 1
+        elif tag == 'div' and ' sharedaddy' in ' ' + ' '.join((element.get('class') or '').split()):
+            if _inside_jetpack_tag(element):
+                continue
+            removed['divs'] += 1
+        else:
+            continue
+        _remove_element(element)
+
+
+def _parse_streaming(html_content: bytes) -> Tuple[etree._Element, Dict[str, int]]:
+    """
+    Parse a large document incrementally, dropping unwanted elements as soon as each one is complete.
+
+    Removed subtrees are released during the parse rather than after the whole DOM has been built.
+    """
+    removed = {'scripts': 0, 'jetpack': 0, 'iframe': 0, 'divs': 0}
+    # A pull parser rather than iterparse, since only the parser accepts default_doctype
+    parser = etree.HTMLPullParser(events=('end',), encoding='utf-8', default_doctype=False)
+
+    for offset in range(0, len(html_content), _STREAMING_CHUNK_SIZE):
+        parser.feed(html_content[offset:offset + _STREAMING_CHUNK_SIZE])
+        _drop_streamed_elements(parser.read_events(), removed)
+
+    root = parser.close()
+    _drop_streamed_elements(parser.read_events(), removed)
+
+    return root, removed
+
+
+def _decompose_all(nodes: list) -> int:
+    """Destroy selectolax nodes last-first, so nested matches go before the ancestors that would free them."""
+    for node in reversed(nodes):
+        node.decompose()
+    return len(nodes)
+
+
+def _analyze_and_transform_lexbor(html_content: bytes, dry_run: bool) -> Tuple[Any, Dict[str, int]]:
+    """selectolax (Lexbor) implementation of _analyze_and_transform."""
+    tree = LexborHTMLParser(html_content)
+
+    # Remove unwanted elements in the same order as _remove_unwanted_elements
+    scripts_removed = _decompose_all(tree.css(_UNWANTED_SCRIPTS_CSS))
+    jetpack_tags_removed = _decompose_all(tree.css(_JETPACK_TAGS_CSS))
+    likes_iframe = tree.css_first(_LIKES_IFRAME_CSS)
     iframe_removed = 1 if likes_iframe else 0
     if likes_iframe:
         likes_iframe.decompose()
+    divs_removed = _decompose_all([
+        node for node in tree.css(_SHAREDADDY_DIVS_CSS)
+        if any(cls.startswith('sharedaddy') for cls in (node.attributes.get('class') or '').split())
+    ])
+
+    # Find the content and sidebar sections
+    content_section = tree.css_first('#content')
+    sidebar_section = tree.css_first('#sidebar')
 
-    # Remove divs with sharedaddy* classes
-    sharedaddy_divs = soup.find_all('div', class_=lambda x: x and any(cls.startswith('sharedaddy') for cls in x if isinstance(x, list)))
-    if not sharedaddy_divs:
-        # Also check for single class strings
-        sharedaddy_divs = soup.find_all('div', class_=lambda x: isinstance(x, str) and x.startswith('sharedaddy'))
+    if content_section is None:
+        raise ValueError("Section with id 'content' not found in HTML")
 
-    divs_removed = len(sharedaddy_divs)
-    for div in sharedaddy_divs:
-        div.decompose()
+    if sidebar_section is None:
+        raise ValueError("Section with id 'sidebar' not found in HTML")
 
     # Remove specific unwanted aside tags and duplicate IDs within sidebar
-    unwanted_ids = {'search-2', 'meta-2'}
-    aside_tags = sidebar_section.find_all('aside', id=True)
     seen_ids = set()
+    asides_to_remove = []
+    duplicates_removed = 0
+    unwanted_removed = 0
+
+    for aside in sidebar_section.css('aside[id]'):
+        aside_id = aside.attributes.get('id')
+        if aside_id in _UNWANTED_ASIDE_IDS:
+            asides_to_remove.append(aside)
+            unwanted_removed += 1
+        elif aside_id in seen_ids:
+            asides_to_remove.append(aside)
+            duplicates_removed += 1
+        else:
+            seen_ids.add(aside_id)
+
+    counts = {
+        'unwanted': unwanted_removed,
+        'duplicates': duplicates_removed,
+        'scripts': scripts_removed,
+        'jetpack': jetpack_tags_removed,
+        'iframe': iframe_removed,
+        'divs': divs_removed,
+    }
+
+    # Nothing below changes the counts, so a dry-run can stop here
+    if dry_run:
+        return tree, counts
+
+    _decompose_all(asides_to_remove)
+
+    # Lexbor inserts a copy, so drop the original sidebar once it is in place after the content
+    content_section.insert_after(sidebar_section)
+    sidebar_section.decompose()
+
+    return tree, counts
+
+
+def _analyze_and_transform_lxml(html_content: bytes, dry_run: bool) -> Tuple[etree._Element, Dict[str, int]]:
+    """lxml implementation of _analyze_and_transform."""
+    if len(html_content) > _STREAMING_THRESHOLD:
+        doc, removed = _parse_streaming(html_content)
+    else:
+        parser = _COUNTING_PARSER if dry_run else _HTML_PARSER
+        doc = html.document_fromstring(html_content, parser=parser)
+        removed = _remove_unwanted_elements(doc)
+
+    # Find the content and sidebar sections
+    content_matches = _ELEMENT_BY_ID_XPATH(doc, id='content')
+    sidebar_matches = _ELEMENT_BY_ID_XPATH(doc, id='sidebar')
+
+    if not content_matches:
+        raise ValueError("Section with id 'content' not found in HTML")
+
+    if not sidebar_matches:
+        raise ValueError("Section with id 'sidebar' not found in HTML")
+
+    content_section = content_matches[0]
+    sidebar_section = sidebar_matches[0]
+
+    # Remove specific unwanted aside tags and duplicate IDs within sidebar
+    aside_tags = _SIDEBAR_ASIDES_XPATH(sidebar_section)
+    seen_ids = set()
+    asides_to_remove = []
     duplicates_removed = 0
     unwanted_removed = 0
 
     for aside in aside_tags:
         aside_id = aside.get('id')
-        if aside_id in unwanted_ids:
+        if aside_id in _UNWANTED_ASIDE_IDS:
             # This is an unwanted aside, remove it
-            aside.decompose()
+            asides_to_remove.append(aside)
             unwanted_removed += 1
         elif aside_id in seen_ids:
             # This is a duplicate ID, remove it
-            aside.decompose()
+            asides_to_remove.append(aside)
             duplicates_removed += 1
         else:
             seen_ids.add(aside_id)
 
+    counts = {
+        'unwanted': unwanted_removed,
+        'duplicates': duplicates_removed,
+        **removed,
+    }
+
+    # Nothing below changes the counts, so a dry-run can stop here
+    if dry_run:
+        return doc, counts
+
+    for aside in asides_to_remove:
+        _remove_element(aside)
+
     # Remove sidebar from its current position
-    sidebar_section.extract()
+    _remove_element(sidebar_section)
+
+    # Insert sidebar immediately after content section, ahead of any text that followed it
+    sidebar_section.tail = content_section.tail
+    content_section.tail = None
+    content_section.addnext(sidebar_section)
+
+    return doc, counts
+
+
+def _analyze_and_transform(html_content: bytes, dry_run: bool = False) -> Tuple[Any, Dict[str, int]]:
+    """
+    Parse HTML, remove unwanted elements and count everything that is removed.
+
+    Unless dry_run is set, the sidebar asides are cleaned up and the sidebar is moved after the content.
+    The returned tree is a selectolax parser when selectolax is installed, otherwise an lxml element.
+
+    Raises:
+        ValueError: If the content is not valid UTF-8 or required sections are not found
+    """
+    # Both parsers would swap undecodable bytes for U+FFFD and --execute would write that back,
+    # so refuse such files the way reading them as UTF-8 text did
+    html_content.decode('utf-8')
+
+    if LexborHTMLParser is not None:
+        return _analyze_and_transform_lexbor(html_content, dry_run)
+    return _analyze_and_transform_lxml(html_content, dry_run)
+
+
+def _serialize(tree: Any) -> bytes:
+    """Serialize a tree returned by _analyze_and_transform to UTF-8 bytes."""
+    if isinstance(tree, etree._Element):
+        # libxml2's HTML serializer writes UTF-8 bytes directly and only escapes what HTML requires
+        return etree.tostring(tree.getroottree(), encoding='utf-8', method='html')
+    return tree.html.encode('utf-8')
 
-    # Insert sidebar immediately after content section
-    content_section.insert_after(sidebar_section)
 
-    return str(soup)
+def move_sidebar_after_content(html_content: bytes, emit_html: bool = True) -> Tuple[Optional[bytes], Dict[str, int]]:
+    """
+    Parse HTML and move sidebar section to immediately follow content section.
+    Also removes aside tags with duplicate IDs and specific unwanted asides within the sidebar section,
+    removes script elements with jetpack-*, sharing-js*, comment-reply* IDs and speculationrules type,
+    removes iframe with likes-master ID, and removes divs with sharedaddy* classes.
+
+    Args:
+        html_content: Raw HTML content as UTF-8 bytes
+        emit_html: Serialize the modified document (set False for dry-runs that only need counts)
+
+    Returns:
+        Tuple of (modified HTML as UTF-8 bytes or None if emit_html is False, counts of removed elements keyed by
+        'unwanted', 'duplicates', 'scripts', 'jetpack', 'iframe' and 'divs')
+
+    Raises:
+        ValueError: If the content is not valid UTF-8 or required sections are not found
+    """
+    tree, counts = _analyze_and_transform(html_content, dry_run=not emit_html)
+
+    if not emit_html:
+        return None, counts
+
+    return _serialize(tree), counts
 
 
 def find_html_files(directory: Path) -> List[Path]:
-    """Find all .html files in the given directory."""
-    html_files = list(directory.glob("*.html"))
-    # Also check subdirectories
-    html_files.extend(directory.glob("**/*.html"))
-    return sorted(set(html_files))  # Remove duplicates and sort
+    """Find all .html files in the given directory and its subdirectories."""
+    return sorted(directory.rglob("*.html"))
+
+
+def _cache_dir() -> Path:
+    """Locate the cache directory, resolved on use so runs without --cache never need a home directory."""
+    return Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'move_sidebar'
+
+
+def _cache_key(html_content: bytes) -> str:
+    """Hash the HTML content together with CACHE_VERSION and the parser backend."""
+    digest = hashlib.blake2b(f'v{CACHE_VERSION}-{_CACHE_BACKEND}'.encode(), digest_size=16)
+    digest.update(html_content)
+    return digest.hexdigest()
 
 
-def process_single_file(file_path: Path, backup: bool = False, dry_run: bool = True) -> Tuple[bool, str]:
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write a cache file via a temporary file so parallel workers never see a partial entry."""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def _load_cached(key: str, emit_html: bool) -> Optional[Tuple[Optional[bytes], Dict[str, int]]]:
+    """Return a cached (modified HTML, counts) result, or None on a cache miss."""
+    try:
+        cache_dir = _cache_dir()
+        counts = json.loads((cache_dir / f"{key}.json").read_bytes())
+        modified_html = (cache_dir / f"{key}.html").read_bytes() if emit_html else None
+    except (OSError, RuntimeError, ValueError):
+        return None
+    return modified_html, counts
+
+
+def _store_cached(key: str, modified_html: Optional[bytes], counts: Dict[str, int]) -> None:
+    """Save a result to the cache; failures are ignored since the cache is only an optimization."""
+    try:
+        cache_dir = _cache_dir()
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        if modified_html is not None:
+            _write_atomic(cache_dir / f"{key}.html", modified_html)
+        _write_atomic(cache_dir / f"{key}.json", json.dumps(counts).encode())
+    except (OSError, RuntimeError):
+        pass
+
+
+def transform_with_cache(html_content: bytes, emit_html: bool = True) -> Tuple[Optional[bytes], Dict[str, int]]:
+    """
+    Run move_sidebar_after_content, reusing an earlier result for identical content.
+
+    Only runs that emit HTML (--execute) write to the cache, so dry-runs leave the filesystem untouched;
+    they can still read counts stored by an earlier --execute.
+    """
+    key = _cache_key(html_content)
+    cached = _load_cached(key, emit_html)
+    if cached is not None:
+        return cached
+
+    modified_html, counts = move_sidebar_after_content(html_content, emit_html=emit_html)
+    if emit_html:
+        _store_cached(key, modified_html, counts)
+    return modified_html, counts
+
+
+def process_single_file(file_path: Path, backup: bool = False, dry_run: bool = True,
+                        use_cache: bool = False, html_content: Optional[bytes] = None) -> Tuple[bool, str]:
     """
     Process a single HTML file.
 
+    Args:
+        html_content: The file's bytes if they have already been read, otherwise they are read here
+
     Returns:
         Tuple of (success, message)
     """
     try:
-        html_content = file_path.read_text(encoding='utf-8')
-
-        # Check for duplicate aside IDs, unwanted asides in sidebar, and jetpack scripts before processing
-        soup_check = BeautifulSoup(html_content, 'lxml')
-        sidebar_check = soup_check.find(id='sidebar')
-        duplicate_count = 0
-        unwanted_count = 0
-        scripts_count = 0
-        jetpack_tags_count = 0
-        iframe_count = 0
-        divs_count = 0
-        unwanted_ids = {'search-2', 'meta-2'}
-
-        # Count unwanted scripts
-        unwanted_scripts_check = []
-        sharing_scripts = soup_check.find_all('script', id=lambda x: x and x.startswith('sharing-js'))
-        unwanted_scripts_check.extend(sharing_scripts)
-        comment_scripts = soup_check.find_all('script', id=lambda x: x and x.startswith('comment-reply'))
-        unwanted_scripts_check.extend(comment_scripts)
-        speculation_scripts = soup_check.find_all('script', type='speculationrules')
-        unwanted_scripts_check.extend(speculation_scripts)
-        scripts_count = len(unwanted_scripts_check)
-
-        # Count jetpack tags
-        jetpack_tags = soup_check.find_all(id=lambda x: x and x.startswith('jetpack-'))
-        jetpack_tags_count = len(jetpack_tags)
-
-        # Count iframe
-        likes_iframe = soup_check.find('iframe', id='likes-master')
-        iframe_count = 1 if likes_iframe else 0
-
-        # Count sharedaddy divs
-        sharedaddy_divs = soup_check.find_all('div', class_=lambda x: x and any(cls.startswith('sharedaddy') for cls in x if isinstance(x, list)))
-        if not sharedaddy_divs:
-            sharedaddy_divs = soup_check.find_all('div', class_=lambda x: isinstance(x, str) and x.startswith('sharedaddy'))
-        divs_count = len(sharedaddy_divs)
-
-        if sidebar_check:
-            aside_tags = sidebar_check.find_all('aside', id=True)
-            seen_ids = set()
-            for aside in aside_tags:
-                aside_id = aside.get('id')
-                if aside_id in unwanted_ids:
-                    unwanted_count += 1
-                elif aside_id in seen_ids:
-                    duplicate_count += 1
-                else:
-                    seen_ids.add(aside_id)
-
-        modified_html = move_sidebar_after_content(html_content)
+        if html_content is None:
+            html_content = file_path.read_bytes()
+
+        # Cheap substring scan so pages without a sidebar never reach the parser
+        if _SIDEBAR_MARKER not in html_content:
+            return False, "Skip: Section with id 'sidebar' not found in HTML"
+
+        transform = transform_with_cache if use_cache else move_sidebar_after_content
+        modified_html, counts = transform(html_content, emit_html=not dry_run)
+        unwanted_count = counts['unwanted']
+        duplicate_count = counts['duplicates']
+        scripts_count = counts['scripts']
+        jetpack_tags_count = counts['jetpack']
+        iframe_count = counts['iframe']
+        divs_count = counts['divs']
 
         if dry_run:
             messages = []
@@ -222,10 +517,10 @@ def process_single_file(file_path: Path, backup: bool = False, dry_run: bool = T
         # Create backup if requested
         if backup:
             backup_file = file_path.with_suffix(file_path.suffix + '.bak')
-            backup_file.write_text(html_content, encoding='utf-8')
+            backup_file.write_bytes(html_content)
 
         # Write modified content
-        file_path.write_text(modified_html, encoding='utf-8')
+        file_path.write_bytes(modified_html)
         backup_msg = " (backup created)" if backup else ""
         messages = []
         if unwanted_count > 0:
@@ -249,6 +544,39 @@ def process_single_file(file_path: Path, backup: bool = False, dry_run: bool = T
         return False, f"Error: {e}"
 
 
+def process_batch(file_paths: List[Path], backup: bool = False, dry_run: bool = True,
+                  use_cache: bool = False) -> List[Tuple[bool, str]]:
+    """
+    Process a batch of HTML files in order, reading upcoming files on a background thread.
+
+    Up to _PREFETCH_DEPTH reads are kept in flight so disk latency overlaps with parsing.
+
+    Returns:
+        List of (success, message) tuples, one per file
+    """
+    results = []
+    remaining = iter(file_paths)
+
+    with ThreadPoolExecutor(max_workers=1) as reader:
+        pending = deque((path, reader.submit(path.read_bytes)) for path in islice(remaining, _PREFETCH_DEPTH))
+
+        while pending:
+            file_path, read = pending.popleft()
+            next_path = next(remaining, None)
+            if next_path is not None:
+                pending.append((next_path, reader.submit(next_path.read_bytes)))
+
+            try:
+                html_content = read.result()
+            except Exception as e:
+                results.append((False, f"Error: {e}"))
+                continue
+
+            results.append(process_single_file(file_path, backup, dry_run, use_cache, html_content))
+
+    return results
+
+
 @click.command()
 @click.argument('input_path', type=click.Path(exists=True, path_type=Path))
 @click.option(
@@ -271,7 +599,14 @@ def process_single_file(file_path: Path, backup: bool = False, dry_run: bool = T
     default=True,
     help='Ask for confirmation before processing multiple files'
 )
-def main(input_path: Path, directory: bool, execute: bool, backup: bool, confirm: bool):
+@click.option(
+    '--cache/--no-cache',
+    default=False,
+    help='Reuse results for files identical to ones seen by an earlier --execute --cache run, e.g. when '
+         're-running from restored backups. Off by default. Each executed page adds a full copy of its '
+         'output to ~/.cache/move_sidebar, which is never pruned; delete it to reclaim space'
+)
+def main(input_path: Path, directory: bool, execute: bool, backup: bool, confirm: bool, cache: bool):
     """
     Move HTML sidebar section to follow content section.
 
@@ -314,20 +649,45 @@ def main(input_path: Path, directory: bool, execute: bool, backup: bool, confirm
     # Process files
     results = []
 
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-        transient=True
-    ) as progress:
-
-        task = progress.add_task("Processing files...", total=len(html_files))
-
-        for file_path in html_files:
-            progress.update(task, description=f"Processing {file_path.name}")
-            success, message = process_single_file(file_path, backup, not execute)
-            results.append((file_path, success, message))
-            progress.advance(task)
+    # Files are independent, so parse them in parallel across all cores;
+    # each worker gets a batch and prefetches its files while parsing
+    count = len(html_files)
+    workers = os.cpu_count() or 1
+    batch_size = max(1, count // (workers * 4))
+    batches = [html_files[i:i + batch_size] for i in range(0, count, batch_size)]
+    with ExitStack() as stack:
+        # A single batch gains nothing from worker processes, and more workers than batches would sit idle
+        if len(batches) == 1:
+            batch_map = map
+        else:
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=min(workers, len(batches))))
+            batch_map = executor.map
+        outcomes = zip(html_files, chain.from_iterable(batch_map(
+            process_batch,
+            batches,
+            repeat(backup),
+            repeat(not execute),
+            repeat(cache)
+        )))
+
+        # The spinner only pays for itself on interactive runs long enough to watch
+        if console.is_terminal and count > 10:
+            with Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                console=console,
+                transient=True
+            ) as progress:
+
+                task = progress.add_task("Processing files...", total=count)
+
+                for file_path, (success, message) in outcomes:
+                    progress.update(task, description=f"Processed {file_path.name}")
+                    results.append((file_path, success, message))
+                    progress.advance(task)
+        else:
+            for file_path, (success, message) in outcomes:
+                results.append((file_path, success, message))
 
     # Display results
     table = Table(title="Processing Results")
@@ -336,11 +696,12 @@ def main(input_path: Path, directory: bool, execute: bool, backup: bool, confirm
     table.add_column("Message")
 
     success_count = 0
+    cwd = Path.cwd()
     for file_path, success, message in results:
         status = "✅ Success" if success else "❌ Failed"
         status_color = "green" if success else "red"
         table.add_row(
-            str(file_path.relative_to(Path.cwd()) if file_path.is_absolute() else file_path),
+            str(file_path.relative_to(cwd) if file_path.is_absolute() else file_path),
             f"[{status_color}]{status}[/{status_color}]",
             message
         )